@@ -1,30 +1,43 @@
-import os
 import json
-import subprocess
+import tarfile
+import requests
 
-def aggregate_data(directory_path):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_loads(data):
     """
-    Fetch data from all JSON files in the given directory.
-    Returns a dictionary containing combined data.
+    Parses JSON from bytes or str, using orjson when it is installed.
+
+    :param data: The JSON document.
+    :return: The parsed object.
     """
-    aggregated_data = {}
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-    # Loop through every file in the directory
-    for filename in os.listdir(directory_path):
-        file_path = os.path.join(directory_path, filename)
+def _json_dumps(obj):
+    """
+    Serializes an object to indented JSON bytes, using orjson when it is installed.
 
-        # Check if the current file is a JSON
-        if filename.endswith(".json"):
-            with open(file_path, 'r') as file:
-                data = json.load(file)
+    :param obj: The object to serialize.
+    :return: The JSON document as bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
 
-                # Extract required data from the JSON content
-                property_name = list(data["css"]["properties"].keys())[0]
-                property_data = data["css"]["properties"][property_name]
-                
-                aggregated_data[property_name] = property_data
+def _extract_property(data):
+    """
+    Extract the property entry from a parsed MDN property JSON document.
+    Returns a (property_name, property_data) tuple.
+    """
+    property_name = next(iter(data["css"]["properties"]))
+    property_data = data["css"]["properties"][property_name]
 
-    return aggregated_data
+    return property_name, property_data
 
 def format_data(aggregated_data):
     """
@@ -50,30 +63,38 @@ def format_data(aggregated_data):
     
     return formatted_data
 
-def clone_mdn_repository():
+def build_consolidated():
     """
-    Clone the MDN browser-compat-data repository's CSS properties folder.
+    Stream the MDN browser-compat-data repository tarball and parse its
+    css/properties/*.json members in memory, without writing them to disk.
+    Returns a dictionary containing combined data.
     """
-    repo_url = "https://github.com/mdn/browser-compat-data.git"
-    subprocess.run(["git", "clone", "--depth=1", repo_url])
-    os.rename("browser-compat-data/css/properties", "properties")
-    subprocess.run(["rm", "-rf", "browser-compat-data"])
+    archive_url = "https://github.com/mdn/browser-compat-data/archive/main.tar.gz"
+    aggregated_data = {}
+
+    with requests.get(archive_url, stream=True) as response:
+        response.raise_for_status()
+        with tarfile.open(fileobj=response.raw, mode='r|gz') as tar:
+            for member in tar:
+                # Members look like browser-compat-data-main/css/properties/<name>.json
+                parts = member.name.split('/')
+                if (member.isfile() and len(parts) == 4 and parts[1:3] == ['css', 'properties']
+                        and parts[3].endswith('.json')):
+                    data = _json_loads(tar.extractfile(member).read())
+                    property_name, property_data = _extract_property(data)
+                    aggregated_data[property_name] = property_data
+
+    return dict(sorted(aggregated_data.items()))
 
 def main():
-    clone_mdn_repository()
-    
-    directory_path = "properties"
     output_filename = "consolidated_data.json"
 
-    aggregated_data = aggregate_data(directory_path)
+    aggregated_data = build_consolidated()
     formatted_data = format_data(aggregated_data)
 
     # Save the formatted data to a single JSON file
-    with open(output_filename, 'w') as outfile:
-        json.dump(formatted_data, outfile, indent=4)
-
-    # Clean up by deleting the properties folder
-    subprocess.run(["rm", "-rf", "properties"])
+    with open(output_filename, 'wb') as outfile:
+        outfile.write(_json_dumps(formatted_data))
 
     print(f"Data saved to {output_filename}")
 
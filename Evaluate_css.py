@@ -1,21 +1,69 @@
-import cssutils
 import requests
-import json
 from tqdm import tqdm
 import logging
 import os
-
-# Suppress cssutils logging to only critical issues
-cssutils.log.setLevel(logging.CRITICAL)
-
-
-def get_css_properties_from_file(css_content):
+import gzip
+import pickle
+import re
+import sys
+import heapq
+import hashlib
+import mmap
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import ijson
+    _IJSON_ERRORS = (ijson.JSONError,)
+except ImportError:
+    ijson = None
+    _IJSON_ERRORS = ()
+
+from Download_mdn_data import _json_dumps, _json_loads
+
+# Body of each `<style scoped>` block in a Vue single-file component
+_STYLE_RE = re.compile(rb'<style[^>]*\bscoped\b[^>]*>(.*?)</style>', re.S)
+# Comments and quoted strings are blanked before scanning, so commented-out
+# declarations and punctuation inside strings (`content: "a;b: c"`) are ignored
+_COMMENT_OR_STRING_RE = re.compile(rb'/\*.*?\*/|("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\')', re.S)
+# Innermost `{ body }` blocks; their preludes are found by looking backwards
+_BLOCK_RE = re.compile(rb'\{([^{}]*)\}')
+# At-rules whose blocks hold rules or nested declarations rather than descriptors
+_CONDITIONAL_AT_RULES = (b'@media', b'@supports', b'@container', b'@layer', b'@scope')
+# A property name at the start of a declaration, i.e. not inside a value
+_DECL_RE = re.compile(rb'(?:^|;)\s*([-a-zA-Z_][-a-zA-Z0-9_]*)\s*:')
+
+# Number of distinct stylesheets whose extracted properties are kept
+PARSE_CACHE_SIZE = 4096
+
+# Local MDN data and its pickled copy
+MDN_DATA_PATH = "consolidated_data.json"
+MDN_CACHE_PATH = "consolidated_data.pkl"
+
+# Downloaded CanIUse data is cached here between runs
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "css-compat")
+CANIUSE_CACHE_PATH = os.path.join(CACHE_DIR, "caniuse.pkl.gz")
+CANIUSE_ETAG_PATH = os.path.join(CACHE_DIR, "caniuse.etag")
+
+# Browsers that compatibility scores are reported for
+BROWSERS = ['chrome', 'firefox', 'safari', 'edge', 'opera']
+# Number of supporting browsers for every possible support bitmask
+_MASK_POPCOUNT = [bin(mask).count('1') for mask in range(1 << len(BROWSERS))]
+
+
+def _get_css_properties_strict(css_content):
     """
-    Extracts CSS properties from a given CSS content string.
+    Extracts CSS properties by building a full stylesheet with cssutils.
 
     :param css_content: The CSS content string.
     :return: A set of CSS properties.
     """
+    import cssutils
+
+    # Suppress cssutils logging to only critical issues
+    cssutils.log.setLevel(logging.CRITICAL)
+
     properties = set()
     parser = cssutils.CSSParser()
     stylesheet = parser.parseString(css_content)
@@ -26,60 +74,412 @@ def get_css_properties_from_file(css_content):
     return properties
 
 
+def _blank_comment_or_string(match):
+    """
+    Replaces a comment with nothing and a quoted string with an empty string.
+
+    :param match: A match of _COMMENT_OR_STRING_RE.
+    :return: The replacement bytes.
+    """
+    return b'' if match.group(1) is None else b'""'
+
+
+def _scan_css(css_buffer):
+    """
+    Scans CSS content for property names.
+
+    Only the matched property names are decoded, the content itself is never
+    converted to a string.
+
+    :param css_buffer: The CSS content as bytes or any bytes-like buffer.
+    :return: A frozenset of CSS properties.
+    """
+    if css_buffer.find(b'/*') != -1 or css_buffer.find(b'"') != -1 or css_buffer.find(b"'") != -1:
+        css_buffer = _COMMENT_OR_STRING_RE.sub(_blank_comment_or_string, css_buffer)
+    properties = set()
+    # Scan the innermost blocks, then replace each of them (prelude included)
+    # with ';' so the declarations of the enclosing block are scanned next
+    while True:
+        pieces = []
+        last = 0
+        for block in _BLOCK_RE.finditer(css_buffer):
+            start = block.start()
+            prelude_start = max(last, css_buffer.rfind(b'{', last, start) + 1,
+                                css_buffer.rfind(b'}', last, start) + 1, css_buffer.rfind(b';', last, start) + 1)
+            prelude = css_buffer[prelude_start:start].lstrip()
+            # Skip at-rule blocks such as @font-face or @page, they hold descriptors
+            if not prelude.startswith(b'@') or prelude.startswith(_CONDITIONAL_AT_RULES):
+                properties.update(sys.intern(m.group(1).lower().decode('ascii'))
+                                  for m in _DECL_RE.finditer(block.group(1)))
+            pieces.append(css_buffer[last:prelude_start])
+            pieces.append(b';')
+            last = block.end()
+        if not pieces:
+            return frozenset(properties)
+        pieces.append(css_buffer[last:])
+        css_buffer = b''.join(pieces)
+
+
+# Extracted properties keyed by content digest, least recently used first
+_parse_cache = OrderedDict()
+
+
+def _parse_css_cached(css_buffer):
+    """
+    Scans CSS content for property names, memoized on a digest of the content.
+
+    Identical stylesheets (vendored copies, shared Vue style blocks) are only
+    scanned once. Keying on the digest means the content itself is not kept.
+
+    :param css_buffer: The CSS content as bytes or any bytes-like buffer.
+    :return: A frozenset of CSS properties.
+    """
+    key = hashlib.blake2b(css_buffer, digest_size=16).digest()
+    properties = _parse_cache.get(key)
+    if properties is None:
+        properties = _scan_css(css_buffer)
+        _parse_cache[key] = properties
+        if len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    else:
+        _parse_cache.move_to_end(key)
+    return properties
+
+
+def get_css_properties_from_file(css_content, strict=False):
+    """
+    Extracts CSS properties from a given CSS content string.
+
+    Property names are collected with a regex scan of the declaration blocks,
+    which is much cheaper than building a stylesheet object model. Results are
+    cached, so the returned frozenset is shared between identical inputs.
+
+    Like the strict cssutils parser, text inside comments and quoted strings
+    is not mistaken for declarations:
+
+    >>> sorted(get_css_properties_from_file('.y { content: "a;b: c" } /* .z { gap: 0 } */'))
+    ['content']
+
+    Declarations of rules that contain nested rules are kept as well:
+
+    >>> sorted(get_css_properties_from_file('.card { padding: 1rem; &:hover { color: red } .title { font-weight: bold } }'))
+    ['color', 'font-weight', 'padding']
+
+    :param css_content: The CSS content, as a string or UTF-8 bytes.
+    :param strict: Parse with cssutils instead of the regex scanner.
+    :return: A set of CSS properties.
+    """
+    if strict:
+        if not isinstance(css_content, str):
+            css_content = bytes(css_content).decode('utf-8', 'replace')
+        return _get_css_properties_strict(css_content)
+    if isinstance(css_content, str):
+        css_content = css_content.encode('utf-8')
+    return _parse_css_cached(css_content)
+
+
+@contextmanager
+def _map_file(file_path):
+    """
+    Memory maps a file read-only so it can be scanned without copying it.
+
+    :param file_path: Path to the file.
+    :return: A context manager yielding the mapped buffer.
+    """
+    with open(file_path, 'rb') as file:
+        # Empty files cannot be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
 def get_css_properties_from_vue_file(file_path):
     """
-    Extracts CSS properties from a Vue file.
+    Extracts CSS properties from all scoped style blocks of a Vue file.
 
     :param file_path: Path to the .vue file.
     :return: A set of CSS properties.
     """
-    with open(file_path, 'r') as file:
-        content = file.read()
-        css_content = content.split('<style scoped>')[-1].split('</style>')[0].strip()
-        return get_css_properties_from_file(css_content)
+    with _map_file(file_path) as buffer:
+        return frozenset().union(*(get_css_properties_from_file(match.group(1))
+                                   for match in _STYLE_RE.finditer(buffer)))
+
+
+def _read_pickle(path, compressed=False):
+    """
+    Loads a pickled cache file.
+
+    :param path: Path to the cache file.
+    :param compressed: Whether the file is gzip compressed.
+    :return: The cached object, or None if it is missing or unreadable.
+    """
+    opener = gzip.open if compressed else open
+    try:
+        with opener(path, 'rb') as file:
+            return pickle.load(file)
+    except Exception:
+        # Caching is best effort; corrupt or incompatible files are rebuilt
+        return None
+
+
+def _write_pickle(path, obj, compressed=False):
+    """
+    Atomically writes an object to a pickled cache file.
+
+    Caching is best effort, so failures to write are ignored.
+
+    :param path: Path to the cache file.
+    :param obj: The object to cache.
+    :param compressed: Whether to gzip compress the file.
+    """
+    opener = gzip.open if compressed else open
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with opener(tmp_path, 'wb') as file:
+            pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
 
 
 def load_mdn_data():
     """
     Load the MDN browser compatibility data from a local JSON file.
 
+    A pickled copy is kept next to the JSON file together with the size and
+    modification time of the JSON file it was made from, and is only used
+    while both still match.
+
     :return: The loaded MDN data.
     """
-    with open("consolidated_data.json", 'r') as file:
-        return json.load(file)
+    stat = os.stat(MDN_DATA_PATH)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cached = _read_pickle(MDN_CACHE_PATH)
+    if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == stamp:
+        return cached[1]
+
+    with open(MDN_DATA_PATH, 'rb') as file:
+        mdn_data = _json_loads(file.read())
+    _write_pickle(MDN_CACHE_PATH, (stamp, mdn_data))
+    return mdn_data
+
+
+class _ResponseReader:
+    """
+    File-like view of a streamed response body for ijson.
+
+    Reading through iter_content() keeps content decoding and error wrapping
+    in requests, so a dropped connection surfaces as a RequestException.
+    """
+
+    def __init__(self, response, chunk_size=64 * 1024):
+        self._chunks = response.iter_content(chunk_size)
+
+    def read(self, size=-1):
+        """
+        Returns the next chunk of the body, or b'' once it is exhausted.
+
+        :param size: Ignored; chunks are returned as they arrive.
+        :return: The next chunk of bytes.
+        """
+        return next(self._chunks, b'')
+
+
+def _read_compatibility_data(response):
+    """
+    Reads the CanIUse payload, keeping only the browser stats used for scoring.
+
+    With ijson installed the features are parsed one at a time straight from
+    the response stream, so the full document is never held in memory.
+
+    :param response: A streamed CanIUse response.
+    :return: A dictionary of the form {"data": {feature: {"stats": {browser: ...}}}}.
+    """
+    if ijson is not None:
+        features = ijson.kvitems(_ResponseReader(response), 'data')
+    else:
+        features = _json_loads(response.content)["data"].items()
+    return {"data": {feature: {"stats": {browser: feature_data["stats"][browser]
+                                         for browser in BROWSERS if browser in feature_data["stats"]}}
+                     for feature, feature_data in features}}
 
 
 def fetch_compatibility_data():
     """
     Fetches browser compatibility data from CanIUse.
 
+    The last download is cached along with its ETag, and reused when the
+    server reports it has not changed or the download fails.
+
     :return: The fetched compatibility data.
     """
     url = "https://raw.githubusercontent.com/Fyrd/caniuse/main/data.json"
+    headers = {}
+    cached_data = None
+    if os.path.exists(CANIUSE_ETAG_PATH):
+        cached_data = _read_pickle(CANIUSE_CACHE_PATH, compressed=True)
+        if cached_data is not None:
+            try:
+                with open(CANIUSE_ETAG_PATH, 'r') as file:
+                    headers["If-None-Match"] = file.read().strip()
+            except (OSError, ValueError):
+                cached_data = None
+
     print("Fetching compatibility data...")
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-    except requests.RequestException as e:
+        # The body is streamed, so read it inside the try as well
+        with requests.get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code == 304:
+                return cached_data
+            compatibility_data = _read_compatibility_data(response)
+            etag = response.headers.get("ETag")
+    except (requests.RequestException, ValueError, KeyError, *_IJSON_ERRORS) as e:
+        # ValueError and KeyError cover truncated or non-JSON bodies
         print(f"Error fetching compatibility data: {e}")
-        return {}
-    return response.json()
+        # Fall back to the last download when there is one
+        return cached_data if cached_data is not None else {}
 
+    if etag:
+        _write_pickle(CANIUSE_CACHE_PATH, compatibility_data, compressed=True)
+        try:
+            with open(CANIUSE_ETAG_PATH, 'w') as file:
+                file.write(etag)
+        except OSError:
+            pass
+    return compatibility_data
 
-def is_supported(browser_data):
+
+def _normalize_support(browser_data):
     """
-    Determines if a given CSS property is supported based on the browser data.
+    Normalizes browser data to the list of entries that count as support.
+
+    Raw data may be a single entry, a list of entries or a placeholder such as
+    "mirror"; only entries with a version_added and no vendor prefix are kept.
 
     :param browser_data: Data indicating browser support for a property.
+    :return: A list of supporting entries.
+    """
+    if isinstance(browser_data, dict):
+        browser_data = [browser_data]
+    elif not isinstance(browser_data, list):
+        return []
+    return [entry for entry in browser_data if 'version_added' in entry and not entry.get('prefix')]
+
+
+def is_supported(entries):
+    """
+    Determines if a given CSS property is supported based on the browser data.
+
+    :param entries: Browser data normalized with _normalize_support.
     :return: True if supported, False otherwise.
     """
-    if isinstance(browser_data, list):
-        for entry in browser_data:
-            if 'version_added' in entry and not entry.get('prefix'):
-                return True
-    elif isinstance(browser_data, dict):
-        return 'version_added' in browser_data and not browser_data.get('prefix')
-    return False
+    return bool(entries)
+
+
+def _support_mask(support_data):
+    """
+    Packs the support of a property into a bitmask, bit i standing for BROWSERS[i].
+
+    :param support_data: Raw support data of a property keyed by browser.
+    :return: The support bitmask.
+    """
+    return sum(1 << i for i, browser in enumerate(BROWSERS)
+               if is_supported(_normalize_support(support_data.get(browser))))
+
+
+# Most recent index per builder, along with the data it was derived from
+_index_cache = {}
+
+
+def _get_cached_index(builder, *sources):
+    """
+    Returns the index built from the given data, building it on first use.
+
+    Only the most recent index per builder is kept, so reloading the data
+    releases the previous data set. The index is rebuilt when other source
+    objects are passed or their sizes changed; other in-place edits of the
+    sources are not detected.
+
+    :param builder: Function that builds the index from the sources.
+    :param sources: The data objects the index is derived from.
+    :return: The built index.
+    """
+    sizes = tuple(len(source) for source in sources)
+    entry = _index_cache.get(builder)
+    if (entry is None or entry[1] != sizes
+            or any(cached is not source for cached, source in zip(entry[0], sources))):
+        entry = (sources, sizes, builder(*sources))
+        _index_cache[builder] = entry
+    return entry[2]
+
+
+def _build_name_index(mdn_data):
+    """
+    Maps every MDN property name, canonical or alternative, to its MDN property.
+
+    :param mdn_data: MDN compatibility data.
+    :return: A dictionary of property name to canonical MDN property name.
+    """
+    name_index = {}
+    for mdn_prop, mdn_prop_data in mdn_data.items():
+        for support_data in mdn_prop_data["support"].values():
+            if isinstance(support_data, list):
+                for entry in support_data:
+                    if "alternative_name" in entry:
+                        # The first MDN property listing the name wins
+                        name_index.setdefault(entry["alternative_name"], mdn_prop)
+    # Canonical names always resolve to themselves
+    name_index.update((mdn_prop, mdn_prop) for mdn_prop in mdn_data)
+    return name_index
+
+
+def _build_support_matrix(mdn_data, compatibility_data):
+    """
+    Precomputes per-browser support for every known property name.
+
+    MDN data takes precedence over CanIUse, which takes precedence over MDN
+    alternative names, mirroring the lookup order used when scoring. Keys are
+    interned, like the extracted property names, so lookups compare by identity.
+    Alternative names resolve to the mask of their canonical MDN property.
+
+    :param mdn_data: MDN compatibility data.
+    :param compatibility_data: CanIUse compatibility data.
+    :return: A dictionary of property name to support bitmask, see _support_mask.
+    """
+    mdn_masks = {prop: _support_mask(prop_data["support"]) for prop, prop_data in mdn_data.items()}
+
+    support_matrix = {}
+    for prop, prop_data in compatibility_data["data"].items():
+        support_matrix[sys.intern(prop)] = _support_mask(prop_data["stats"])
+    name_index = _get_cached_index(_build_name_index, mdn_data)
+    for name, mdn_prop in name_index.items():
+        if name == mdn_prop or name not in support_matrix:
+            support_matrix[sys.intern(name)] = mdn_masks[mdn_prop]
+    return support_matrix
+
+
+def _score_masks(masks):
+    """
+    Scores a batch of support bitmasks.
+
+    At most 2 ** len(BROWSERS) distinct masks exist, so per-browser totals are
+    taken over the mask counts rather than over every property.
+
+    :param masks: One support bitmask per property.
+    :return: Percentage of properties supported per browser, and percentage
+             of browsers supporting each property.
+    """
+    mask_scores = [(_MASK_POPCOUNT[mask] / len(BROWSERS)) * 100 for mask in masks]
+    if not masks:
+        return [], mask_scores
+    mask_counts = Counter(masks).items()
+    browser_scores = [(sum(count for mask, count in mask_counts if mask >> i & 1) / len(masks)) * 100
+                      for i in range(len(BROWSERS))]
+    return browser_scores, mask_scores
 
 
 def calculate_compatibility_score(properties, compatibility_data, mdn_data):
@@ -91,53 +491,30 @@ def calculate_compatibility_score(properties, compatibility_data, mdn_data):
     :param mdn_data: MDN compatibility data.
     :return: Compatibility scores and least supported properties.
     """
-    browsers = ['chrome', 'firefox', 'safari', 'edge', 'opera']
-    scores = {browser: 0 for browser in browsers}
+    support_matrix = _get_cached_index(_build_support_matrix, mdn_data, compatibility_data)
     property_scores = {}
-    total_props = 0
-
-    for prop in tqdm(properties, desc="Checking compatibility"):
-        prop_score = 0
-        if prop in mdn_data:
-            support_data = mdn_data[prop]["support"]
-            for browser in browsers:
-                if is_supported(support_data.get(browser)):
-                    scores[browser] += 1
-                    prop_score += 1
-            total_props += 1
-        elif prop in compatibility_data["data"]:
-            for browser in browsers:
-                if is_supported(compatibility_data["data"][prop]["stats"][browser]):
-                    scores[browser] += 1
-                    prop_score += 1
-            total_props += 1
-        else:
-            alt_name_found = False
-            for mdn_prop, mdn_prop_data in mdn_data.items():
-                alt_names = [entry.get("alternative_name") for support_data in mdn_prop_data["support"].values()
-                             if isinstance(support_data, list) for entry in support_data if "alternative_name" in entry]
-                if prop in alt_names:
-                    for browser in browsers:
-                        if is_supported(mdn_prop_data["support"].get(browser)):
-                            scores[browser] += 1
-                            prop_score += 1
-                    alt_name_found = True
-                    total_props += 1
-                    break
-            if not alt_name_found:
-                print(f"Warning: No compatibility data found for the property '{prop}'.")
-
-        property_scores[prop] = (prop_score / len(browsers)) * 100
-
-    worst_offenders = [item for item in property_scores.items() if item[1] < 100]
-    worst_offenders.sort(key=lambda x: x[1])
-
-    for browser, score in scores.items():
-        scores[browser] = round((score / total_props) * 100, 2)
-
-    overall_score = round(sum(scores.values()) / len(browsers), 2)
-
-    return scores, overall_score, worst_offenders[:10]
+    matched = []
+    masks = []
+
+    for prop in properties:
+        mask = support_matrix.get(prop)
+        if mask is None:
+            print(f"Warning: No compatibility data found for the property '{prop}'.")
+            property_scores[prop] = 0.0
+            continue
+        matched.append(prop)
+        masks.append(mask)
+
+    browser_scores, mask_scores = _score_masks(masks)
+    property_scores.update(zip(matched, mask_scores))
+    scores = {browser: round(score, 2) for browser, score in zip(BROWSERS, browser_scores)}
+
+    worst_offenders = heapq.nsmallest(10, (item for item in property_scores.items() if item[1] < 100),
+                                      key=lambda x: x[1])
+
+    overall_score = round(sum(scores.values()) / len(BROWSERS), 2)
+
+    return scores, overall_score, worst_offenders
 
 
 def get_key_from_path(path):
@@ -153,6 +530,28 @@ def get_key_from_path(path):
     return os.path.join(parts[-2], parts[-1])
 
 
+def _walk_css_vue(root):
+    """
+    Recursively yields the paths of .css and .vue files under a directory.
+
+    :param root: The directory to walk.
+    :return: A generator of file paths.
+    """
+    pending = [root]
+    while pending:
+        try:
+            scanner = os.scandir(pending.pop())
+        except OSError:
+            # Skip unreadable directories, like os.walk does
+            continue
+        with scanner as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(('.css', '.vue')) and entry.is_file():
+                    yield entry.path
+
+
 def process_file(file_path, mdn_data, compatibility_data):
     """
     Processes a given file (either .vue or .css) and returns compatibility scores.
@@ -165,8 +564,8 @@ def process_file(file_path, mdn_data, compatibility_data):
     if file_path.endswith('.vue'):
         properties = get_css_properties_from_vue_file(file_path)
     elif file_path.endswith('.css'):
-        with open(file_path, 'r') as file:
-            properties = get_css_properties_from_file(file.read())
+        with _map_file(file_path) as buffer:
+            properties = get_css_properties_from_file(buffer)
     else:
         print("Unsupported file type!")
         return None, None, None  # Return None for all three values
@@ -185,8 +584,22 @@ def main(input_path):
 
     :param input_path: Path to the file or directory to process.
     """
-    mdn_data = load_mdn_data()
-    compatibility_data = fetch_compatibility_data()
+    # Fail before any network I/O when the MDN data has not been downloaded
+    if not os.path.exists(MDN_DATA_PATH):
+        print(f"MDN data not found at {MDN_DATA_PATH}, run Download_mdn_data.py first.")
+        return
+
+    # Loading the local MDN data overlaps with the CanIUse download
+    executor = ThreadPoolExecutor(max_workers=1)
+    compatibility_future = executor.submit(fetch_compatibility_data)
+    try:
+        mdn_data = load_mdn_data()
+    except BaseException:
+        # Report the error right away instead of after the download finishes
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    compatibility_data = compatibility_future.result()
+    executor.shutdown()
     if not compatibility_data:
         print("Failed to fetch compatibility data.")
         return
@@ -195,7 +608,7 @@ def main(input_path):
     worst_files = []  # A list to store files and their overall scores
     all_least_supported = {}  # A dictionary to aggregate least-supported properties
 
-    total_scores = {browser: 0 for browser in ['chrome', 'firefox', 'safari', 'edge', 'opera']}
+    total_scores = {browser: 0 for browser in BROWSERS}
     total_overall = 0
     num_files = 0
 
@@ -214,28 +627,25 @@ def main(input_path):
             for browser, score in file_scores.items():
                 total_scores[browser] += score
     elif os.path.isdir(input_path):
-        for root, _, files in os.walk(input_path):
-            for file in tqdm(files, desc="Processing files"):
-                if file.endswith(('.css', '.vue')):
-                    file_path = os.path.join(root, file)
-                    file_scores, overall_score, least_supported = process_file(file_path, mdn_data, compatibility_data)
-                    if file_scores and overall_score:
-                        key = get_key_from_path(file_path)
-                        results["files"][key] = {
-                            'scores': file_scores,
-                            'overall_score': overall_score,
-                            'least_supported': least_supported
-                        }
-                        # Aggregate data for later sorting and average calculation
-                        num_files += 1
-                        total_overall += overall_score
-                        for browser, score in file_scores.items():
-                            total_scores[browser] += score
-                        worst_files.append((key, overall_score))
-                        for prop, score in least_supported:
-                            if prop not in all_least_supported:
-                                all_least_supported[prop] = []
-                            all_least_supported[prop].append(score)
+        for file_path in tqdm(list(_walk_css_vue(input_path)), desc="Processing files"):
+            file_scores, overall_score, least_supported = process_file(file_path, mdn_data, compatibility_data)
+            if file_scores and overall_score:
+                key = get_key_from_path(file_path)
+                results["files"][key] = {
+                    'scores': file_scores,
+                    'overall_score': overall_score,
+                    'least_supported': least_supported
+                }
+                # Aggregate data for later sorting and average calculation
+                num_files += 1
+                total_overall += overall_score
+                for browser, score in file_scores.items():
+                    total_scores[browser] += score
+                worst_files.append((key, overall_score))
+                for prop, score in least_supported:
+                    if prop not in all_least_supported:
+                        all_least_supported[prop] = []
+                    all_least_supported[prop].append(score)
 
     if num_files > 0:
         # Calculate average scores
@@ -253,8 +663,8 @@ def main(input_path):
         worst_properties.sort(key=lambda x: x[1])
         results["worst_properties"] = worst_properties[:10]
 
-    with open('compatibility_results.json', 'w') as f:
-        json.dump(results, f, indent=4)
+    with open('compatibility_results.json', 'wb') as f:
+        f.write(_json_dumps(results))
     print("Results saved to compatibility_results.json!")
 
 if __name__ == "__main__":